@@ -6,7 +6,7 @@ from asgi_correlation_id import correlation_id
 
 from app.routes import setup_routes
 from app.middlewares import setup_middlewares
-from app.apis.retailcrm import RetailCRM_API
+from app.accounts import RetailCRMAccountPool
 
 from config import settings
 
@@ -36,12 +36,14 @@ def setup_app():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    retailCRM_api_client = RetailCRM_API(
-        api_key=settings.RETAILCRM_API_KEY, subdomain=settings.RETAILCRM_SUBDOMAIN
+    retailCRM_account_pool = RetailCRMAccountPool(
+        accounts=settings.RETAILCRM_ACCOUNTS,
+        max_active=settings.RETAILCRM_MAX_ACTIVE_ACCOUNTS,
     )
-    app.state.retailCRM_api_client = retailCRM_api_client
+    retailCRM_account_pool.start(settings.RETAILCRM_DEFAULT_ACCOUNT)
+    app.state.retailCRM_account_pool = retailCRM_account_pool
     yield
-    await retailCRM_api_client.close()
+    await retailCRM_account_pool.close()
 
 
 async def unhandled_exception_handler(request: Request, exc: Exception):
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from app.apis.retailcrm import RetailCRM_API, RetailCRM_API_Metrics
+from app.search import ClientSearchIndex, maintain_client_search_index
+
+from config import settings, RetailCRMAccount
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetailCRMAccountPool:
+    """Lazily created RetailCRM API clients, one per configured account.
+
+    Every account gets its own httpx pool, rate limiter and search index.
+    When more than ``max_active`` accounts are in use, the least recently
+    used ones without in-flight requests are closed. Metrics are kept for
+    evicted accounts too.
+    """
+
+    def __init__(self, accounts: dict[str, RetailCRMAccount], max_active: int):
+        self.accounts = accounts
+        self.max_active = max_active
+        self._clients: OrderedDict[str, RetailCRM_API] = OrderedDict()
+        self._leases: dict[str, int] = {}
+        self._search_index_tasks: dict[str, asyncio.Task] = {}
+        self._closing_tasks: set[asyncio.Task] = set()
+        self.metrics: dict[str, RetailCRM_API_Metrics] = {}
+
+    def __contains__(self, account: str) -> bool:
+        return account in self.accounts
+
+    def _create_client(self, account: str) -> RetailCRM_API:
+        logger.info("Creating RetailCRM API client for account '%s'", account)
+        account_settings = self.accounts[account]
+
+        search_index = None
+        if settings.CLIENT_SEARCH_INDEX_ENABLED:
+            search_index = ClientSearchIndex(
+                snapshot_path=os.path.join(
+                    settings.CLIENT_SEARCH_INDEX_DIR,
+                    f"{account_settings.subdomain}.json",
+                )
+                if settings.CLIENT_SEARCH_INDEX_DIR
+                else None
+            )
+
+        client = RetailCRM_API(
+            api_key=account_settings.api_key,
+            subdomain=account_settings.subdomain,
+            search_index=search_index,
+            metrics=self.metrics.setdefault(account, RetailCRM_API_Metrics()),
+            hedge_percentile=settings.RETAILCRM_HEDGE_PERCENTILE,
+            response_cache_ttl=settings.RETAILCRM_RESPONSE_CACHE_TTL,
+        )
+
+        if search_index is not None:
+            self._search_index_tasks[account] = asyncio.create_task(
+                maintain_client_search_index(
+                    client, settings.CLIENT_SEARCH_INDEX_REFRESH_INTERVAL
+                )
+            )
+
+        return client
+
+    async def _close_client(
+        self, client: RetailCRM_API, search_index_task: asyncio.Task | None
+    ):
+        if search_index_task is not None:
+            search_index_task.cancel()
+            await client.search_index.save()
+
+        await client.close()
+
+    def start(self, default_account: str):
+        """Start search indexes ahead of the first request.
+
+        Without the search index clients are only created on demand. The
+        default account is added last, so it is the last one to be evicted.
+        """
+        if not settings.CLIENT_SEARCH_INDEX_ENABLED:
+            return
+
+        accounts = [account for account in self.accounts if account != default_account]
+        for account in [*accounts[: self.max_active - 1], default_account]:
+            self._clients[account] = self._create_client(account)
+
+    def _evict(self):
+        for account in list(self._clients):
+            if len(self._clients) <= self.max_active:
+                break
+            if self._leases.get(account):
+                continue
+
+            logger.info("Evicting idle RetailCRM API client for account '%s'", account)
+            task = asyncio.create_task(
+                self._close_client(
+                    self._clients.pop(account),
+                    self._search_index_tasks.pop(account, None),
+                )
+            )
+            self._closing_tasks.add(task)
+            task.add_done_callback(self._closing_tasks.discard)
+
+    @asynccontextmanager
+    async def lease(self, account: str):
+        client = self._clients.get(account)
+        if client is None:
+            client = self._clients[account] = self._create_client(account)
+        else:
+            self._clients.move_to_end(account)
+
+        self._leases[account] = self._leases.get(account, 0) + 1
+        try:
+            yield client
+        finally:
+            self._leases[account] -= 1
+            self._evict()
+
+    def get_metrics(self) -> dict[str, dict]:
+        return {
+            account: {
+                "active": account in self._clients,
+                "in_flight": self._leases.get(account, 0),
+                **metrics.as_dict(),
+            }
+            for account, metrics in self.metrics.items()
+        }
+
+    async def close(self):
+        while self._clients:
+            account, client = self._clients.popitem()
+            await self._close_client(
+                client, self._search_index_tasks.pop(account, None)
+            )
+
+        if self._closing_tasks:
+            await asyncio.gather(*self._closing_tasks)
@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import json
+from collections import deque
+from time import perf_counter
 
 import httpx
 from aiolimiter import AsyncLimiter
@@ -15,7 +18,12 @@ from app.models import (
     GetClientOrdersRequest,
     GetClientsResponse,
     GetClientOrdersResponse,
+    SearchClientsRequest,
+    SearchClientsResponse,
+    ClientSearchResult,
 )
+from app.cache import ResponseCache
+from app.search import ClientSearchIndex
 
 
 logger = logging.getLogger(__name__)
@@ -37,7 +45,38 @@ class ServiceTemporaryUnavailableException(BaseRetailCRMAPIException):
     pass
 
 
+class RetailCRM_API_Metrics:
+    def __init__(self):
+        self.requests = 0
+        self.failed_requests = 0
+        self.upstream_time = 0.0
+        self.rate_limit_wait_time = 0.0
+        self.hedge_eligible_requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "upstream_time": round(self.upstream_time, 4),
+            "rate_limit_wait_time": round(self.rate_limit_wait_time, 4),
+            "hedge_eligible_requests": self.hedge_eligible_requests,
+            "hedged_requests": self.hedged_requests,
+            "hedge_rate": round(
+                self.hedged_requests / self.hedge_eligible_requests, 4
+            )
+            if self.hedge_eligible_requests
+            else 0.0,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
 class RetailCRM_API:
+    hedge_min_samples = 20
+    # Share of the rate limit that background rebuilds leave to live requests
+    rebuild_rate_limit_reserve = 0.5
+
     def __init__(
         self,
         api_key: str,
@@ -45,6 +84,11 @@ class RetailCRM_API:
         api_version: str = "v5",
         rate_limit: tuple[int, int] | None = (10, 1),
         retries: int = 2,
+        search_index: ClientSearchIndex | None = None,
+        metrics: RetailCRM_API_Metrics | None = None,
+        hedge_percentile: float | None = None,
+        hedge_latency_window: int = 200,
+        response_cache_ttl: float = 0,
     ):
         self.api_key = api_key
         self.subdomain = subdomain
@@ -58,6 +102,11 @@ class RetailCRM_API:
             else None
         )
         self.retries = retries
+        self.search_index = search_index
+        self.metrics = metrics or RetailCRM_API_Metrics()
+        self.hedge_percentile = hedge_percentile
+        self._get_latencies: deque[float] = deque(maxlen=hedge_latency_window)
+        self.response_cache = ResponseCache(ttl=response_cache_ttl)
 
     def _generate_auth_headers(self) -> dict[str, str]:
         return {
@@ -82,6 +131,96 @@ class RetailCRM_API:
 
         return data
 
+    def _get_hedge_delay(self) -> float | None:
+        if (
+            self.hedge_percentile is None
+            or len(self._get_latencies) < self.hedge_min_samples
+        ):
+            return None
+
+        latencies = sorted(self._get_latencies)
+        position = int(len(latencies) * self.hedge_percentile / 100)
+        return latencies[min(position, len(latencies) - 1)]
+
+    def _has_spare_rate_limit(self) -> bool:
+        return self.rate_limiter is None or self.rate_limiter.has_capacity()
+
+    async def _wait_for_rate_limit_reserve(self):
+        if self.rate_limiter is None:
+            return
+
+        max_rate = self.rate_limiter.max_rate
+        amount = min(max_rate * self.rebuild_rate_limit_reserve + 1, max_rate)
+        while not self.rate_limiter.has_capacity(amount):
+            await asyncio.sleep(
+                self.rate_limiter.time_period / self.rate_limiter.max_rate
+            )
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        start_time = perf_counter()
+        response = await self._client.send(request)
+        if request.method == "GET":
+            self._get_latencies.append(perf_counter() - start_time)
+
+        return response
+
+    async def _send_hedged(self, request: httpx.Request) -> httpx.Response:
+        """Send an idempotent request, duplicating it if it is slower than usual.
+
+        The duplicate goes out once the request has been running longer than
+        ``hedge_percentile`` of recent GET latencies and only if the rate limiter
+        has spare capacity. The first response without a server error wins and the
+        other request is cancelled.
+        """
+        self.metrics.hedge_eligible_requests += 1
+        hedge_delay = self._get_hedge_delay()
+        if hedge_delay is None:
+            return await self._send(request)
+
+        start_time = perf_counter()
+        primary = asyncio.create_task(self._send(request))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            if done or not self._has_spare_rate_limit():
+                return await primary
+
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            logger.info(
+                "Hedging RetailCRM API request '%s %s'",
+                request.method,
+                request.url.path,
+            )
+            self.metrics.hedged_requests += 1
+            hedge = asyncio.create_task(self._send(request))
+
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None and task.result().status_code < 500:
+                        if task is hedge:
+                            self.metrics.hedge_wins += 1
+                        return task.result()
+
+            return primary.result()
+        finally:
+            if not primary.done():
+                # Keep the slow tail in the window, otherwise the percentile
+                # drifts down with every hedge the primary loses
+                self._get_latencies.append(perf_counter() - start_time)
+            for task in (primary, hedge):
+                if task is None:
+                    continue
+                if task.done():
+                    if not task.cancelled():
+                        task.exception()
+                else:
+                    task.cancel()
+
     async def _make_api_request(
         self,
         method: str,
@@ -92,10 +231,13 @@ class RetailCRM_API:
         **kwargs,
     ) -> dict:
         logger.info("Making RetailCRM API request '%s %s'", method, path)
+        self.metrics.requests += 1
         try:
             if self.rate_limiter is not None:
+                start_time = perf_counter()
                 async with self.rate_limiter:
                     pass
+                self.metrics.rate_limit_wait_time += perf_counter() - start_time
 
             request = self._client.build_request(
                 method.upper(),
@@ -105,7 +247,14 @@ class RetailCRM_API:
                 data=self._prepare_request_data(data),
                 **kwargs,
             )
-            response = await self._client.send(request)
+            start_time = perf_counter()
+            try:
+                if request.method == "GET":
+                    response = await self._send_hedged(request)
+                else:
+                    response = await self._send(request)
+            finally:
+                self.metrics.upstream_time += perf_counter() - start_time
 
             if response.status_code == 503:
                 raise ServiceTemporaryUnavailableException
@@ -128,11 +277,16 @@ class RetailCRM_API:
                         f"{response_error_msg} {response_errors}"
                     )
 
+            if request.method != "GET":
+                self.response_cache.clear()
+
             return response_data
         except (InvalidInputException, RequestFailedException):
+            self.metrics.failed_requests += 1
             logger.exception("RetailCRM API request '%s %s' failed", method, path)
             raise
         except:
+            self.metrics.failed_requests += 1
             if retries is None:
                 retries = self.retries
             if retries:
@@ -187,7 +341,50 @@ class RetailCRM_API:
             },
         )
 
-        return CreatedClientResponse(**response)
+        created_client = CreatedClientResponse(**response)
+
+        if self.search_index is not None:
+            self.search_index.add(
+                ClientSearchResult(
+                    id=created_client.id,
+                    firstName=request.firstName,
+                    lastName=request.lastName,
+                    email=request.email,
+                    phones=request.phones,
+                )
+            )
+
+        return created_client
+
+    async def search_clients(
+        self, request: SearchClientsRequest
+    ) -> SearchClientsResponse:
+        if self.search_index is None or not self.search_index.ready:
+            raise ServiceTemporaryUnavailableException
+
+        return SearchClientsResponse(
+            clients=self.search_index.search(request.q, request.limit)
+        )
+
+    async def rebuild_search_index(self) -> int:
+        logger.info("Rebuilding client search index")
+        self.search_index.begin_rebuild()
+
+        clients = []
+        page, total_page_count = 1, 1
+        while page <= total_page_count:
+            await self._wait_for_rate_limit_reserve()
+            response = await self.get_clients(GetClientsRequest(page=page, limit="100"))
+            clients.extend(
+                ClientSearchResult(**client.model_dump()) for client in response.clients
+            )
+            total_page_count = response.pagination.totalPageCount
+            page += 1
+
+        self.search_index.replace(clients)
+        logger.info("Client search index rebuilt (%d clients)", len(clients))
+
+        return len(clients)
 
     async def get_client_orders(
         self, request: GetClientOrdersRequest
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from hashlib import sha256
+from time import monotonic
+from typing import Awaitable, Callable, Hashable
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+
+class CachedResponse:
+    def __init__(self, body: bytes, etag: str, expires_at: float):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """Serialized responses kept for ``ttl`` seconds (disabled when ``ttl`` is 0).
+
+    At most ``max_size`` responses are kept, least recently used ones are
+    dropped first. ``generation`` changes on every ``clear()``, so responses
+    fetched before a clear are not stored.
+    """
+
+    def __init__(self, ttl: float = 0, max_size: int = 1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.generation = 0
+        self._responses: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        cached_response = self._responses.get(key)
+        if cached_response is None:
+            return None
+
+        if cached_response.expires_at <= monotonic():
+            del self._responses[key]
+            return None
+
+        self._responses.move_to_end(key)
+        return cached_response
+
+    def set(
+        self, key: Hashable, model: BaseModel, generation: int | None = None
+    ) -> CachedResponse:
+        body = model.model_dump_json(by_alias=True).encode()
+        cached_response = CachedResponse(
+            body=body,
+            etag=f'"{sha256(body).hexdigest()[:32]}"',
+            expires_at=monotonic() + self.ttl,
+        )
+
+        if self.ttl > 0 and generation in (None, self.generation):
+            self._responses[key] = cached_response
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_size:
+                self._responses.popitem(last=False)
+
+        return cached_response
+
+    def clear(self):
+        self.generation += 1
+        self._responses.clear()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+
+    return False
+
+
+async def conditional_response(
+    cache: ResponseCache,
+    key: Hashable,
+    if_none_match: str | None,
+    fetch: Callable[[], Awaitable[BaseModel]],
+) -> Response:
+    """JSON response with a strong ETag, or 304 if the client copy is current.
+
+    A fresh cached copy is used without calling ``fetch``.
+    """
+    cached_response = cache.get(key)
+    if cached_response is None:
+        generation = cache.generation
+        cached_response = cache.set(key, await fetch(), generation)
+
+    headers = {"ETag": cached_response.etag}
+    if etag_matches(if_none_match, cached_response.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=cached_response.body,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,5 +1,5 @@
 from typing import Annotated
-from fastapi import Depends, Request, HTTPException, status
+from fastapi import Depends, Header, Request, HTTPException, status
 
 from app.apis.retailcrm import (
     RetailCRM_API,
@@ -9,23 +9,43 @@ from app.apis.retailcrm import (
     BaseRetailCRMAPIException,
 )
 
+from config import settings
 
-async def get_retailcrm_api_client(request: Request):
-    try:
-        yield request.app.state.retailCRM_api_client
-    except ServiceTemporaryUnavailableException:
+
+async def get_retailcrm_api_client(
+    request: Request,
+    account: Annotated[
+        str | None,
+        Header(
+            alias="X-RetailCRM-Account",
+            description="Аккаунт RetailCRM (по умолчанию используется основной)",
+        ),
+    ] = None,
+):
+    account = account or settings.RETAILCRM_DEFAULT_ACCOUNT
+    account_pool = request.app.state.retailCRM_account_pool
+    if account not in account_pool:
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Сервис временно не доступен",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестный аккаунт RetailCRM '{account}'",
         )
-    except InvalidInputException as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except RequestFailedException as e:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
-    except BaseRetailCRMAPIException:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY)
-    except:
-        raise
+
+    async with account_pool.lease(account) as retailcrm_api_client:
+        try:
+            yield retailcrm_api_client
+        except ServiceTemporaryUnavailableException:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис временно не доступен",
+            )
+        except InvalidInputException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except RequestFailedException as e:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+        except BaseRetailCRMAPIException:
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY)
+        except:
+            raise
 
 
 RetailCRM_API_Client_Dep = Annotated[RetailCRM_API, Depends(get_retailcrm_api_client)]
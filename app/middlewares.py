@@ -15,8 +15,13 @@ def setup_middlewares(app: FastAPI):
         CORSMiddleware,
         allow_origins=["*"],
         allow_methods=["*"],
-        allow_headers=["X-Requested-With", "X-Request-ID"],
-        expose_headers=["X-Request-ID"],
+        allow_headers=[
+            "X-Requested-With",
+            "X-Request-ID",
+            "X-RetailCRM-Account",
+            "If-None-Match",
+        ],
+        expose_headers=["X-Request-ID", "ETag"],
     )
     app.add_middleware(CorrelationIdMiddleware)
 
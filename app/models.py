@@ -211,3 +211,32 @@ class CreatedOrderPaymentResponse(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
     id: int
+
+
+class SearchClientsRequest(BaseModel):
+    q: str = Field(
+        description="Начало имени, фамилии, email или номера телефона клиента",
+        examples=["Иван"],
+        min_length=1,
+        max_length=255,
+    )
+    limit: Optional[int] = Field(
+        default=10,
+        description="Максимальное кол-во результатов",
+        ge=1,
+        le=50,
+    )
+
+
+class ClientSearchResult(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    id: int
+    firstName: Optional[str] = None
+    lastName: Optional[str] = None
+    email: Optional[str] = None
+    phones: Optional[list[Phone]] = None
+
+
+class SearchClientsResponse(BaseModel):
+    clients: list[ClientSearchResult]
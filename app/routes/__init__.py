@@ -1,4 +1,4 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Request
 
 from app.routes.clients import router as clients_router
 from app.routes.orders import router as orders_router
@@ -6,6 +6,7 @@ from app.routes.orders import router as orders_router
 
 def setup_routes(app: FastAPI):
     app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(clients_router)
     app.include_router(orders_router)
 
@@ -16,3 +17,11 @@ health_router = APIRouter(prefix="/health", include_in_schema=False)
 @health_router.get("")
 async def get_health():
     return {"health": "OK"}
+
+
+metrics_router = APIRouter(prefix="/metrics", include_in_schema=False)
+
+
+@metrics_router.get("/accounts")
+async def get_accounts_metrics(request: Request):
+    return request.app.state.retailCRM_account_pool.get_metrics()
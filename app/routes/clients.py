@@ -1,6 +1,7 @@
 from typing import Annotated
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, Query
 
+from app.cache import conditional_response
 from app.dependencies import RetailCRM_API_Client_Dep
 from app.models import (
     GetClientsRequest,
@@ -10,8 +11,12 @@ from app.models import (
     GetClientOrdersRequest,
     GetClientOrdersResponse,
     GetClientsResponse,
+    SearchClientsRequest,
+    SearchClientsResponse,
 )
 
+from config import settings
+
 
 router = APIRouter(
     prefix="/clients",
@@ -19,12 +24,38 @@ router = APIRouter(
 )
 
 
-@router.get("", response_model=GetClientsResponse)
+@router.get(
+    "",
+    response_model=GetClientsResponse,
+    responses={304: {"description": "Данные не изменились"}},
+)
 async def get_clients(
     retailcrm_api_client: RetailCRM_API_Client_Dep,
     filter_query: Annotated[GetClientsRequest, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    return await conditional_response(
+        retailcrm_api_client.response_cache,
+        ("clients", filter_query.model_dump_json()),
+        if_none_match,
+        lambda: retailcrm_api_client.get_clients(filter_query),
+    )
+
+
+async def search_clients(
+    retailcrm_api_client: RetailCRM_API_Client_Dep,
+    search_query: Annotated[SearchClientsRequest, Query()],
 ):
-    return await retailcrm_api_client.get_clients(filter_query)
+    return await retailcrm_api_client.search_clients(search_query)
+
+
+if settings.CLIENT_SEARCH_INDEX_ENABLED:
+    router.add_api_route(
+        "/search",
+        search_clients,
+        methods=["GET"],
+        response_model=SearchClientsResponse,
+    )
 
 
 @router.post("", response_model=CreatedClientResponse)
@@ -34,12 +65,22 @@ async def create_client(
     return await retailcrm_api_client.create_client(request_data)
 
 
-@router.get("/{client_id}/orders", response_model=GetClientOrdersResponse)
+@router.get(
+    "/{client_id}/orders",
+    response_model=GetClientOrdersResponse,
+    responses={304: {"description": "Данные не изменились"}},
+)
 async def get_client_orders(
     retailcrm_api_client: RetailCRM_API_Client_Dep,
     client_id: int,
     pagination: Annotated[PaginatedRequest, Query()],
+    if_none_match: Annotated[str | None, Header()] = None,
 ):
-    return await retailcrm_api_client.get_client_orders(
-        GetClientOrdersRequest(client_id=client_id, **pagination.dict())
+    orders_request = GetClientOrdersRequest(client_id=client_id, **pagination.dict())
+
+    return await conditional_response(
+        retailcrm_api_client.response_cache,
+        ("orders", orders_request.model_dump_json()),
+        if_none_match,
+        lambda: retailcrm_api_client.get_client_orders(orders_request),
     )
@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import json
+import os
+import re
+import time
+from bisect import bisect_left, insort
+
+from app.models import ClientSearchResult
+
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_VERSION = 1
+
+PHONE_QUERY_RE = re.compile(r"[\d\s()+-]+")
+
+REBUILD_RETRY_MIN_DELAY = 5
+REBUILD_RETRY_MAX_DELAY = 300
+
+
+def normalize_text(value: str | None) -> str:
+    return " ".join(value.lower().replace("ё", "е").split()) if value else ""
+
+
+def normalize_phone(value: str | None) -> str:
+    digits = re.sub(r"\D", "", value or "")
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+
+    return digits
+
+
+class ClientSearchIndex:
+    """In-memory prefix index over client names, emails and phone numbers.
+
+    Each field is kept as a sorted list of ``(key, client_id)`` pairs, so a
+    prefix lookup is a bisect followed by a short forward scan.
+    """
+
+    def __init__(self, snapshot_path: str | None = None):
+        self.snapshot_path = snapshot_path
+        self._pending: list[ClientSearchResult] | None = None
+        self._clients: dict[int, ClientSearchResult] = {}
+        self._keys: dict[int, list[tuple[str, str]]] = {}
+        self._names: list[tuple[str, int]] = []
+        self._emails: list[tuple[str, int]] = []
+        self._phones: list[tuple[str, int]] = []
+        self.ready = False
+        self.saved_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _fields(self, client: ClientSearchResult) -> list[tuple[str, str]]:
+        keys = []
+        first_name = normalize_text(client.firstName)
+        last_name = normalize_text(client.lastName)
+        for name in (
+            first_name,
+            last_name,
+            f"{first_name} {last_name}".strip(),
+            f"{last_name} {first_name}".strip(),
+        ):
+            if name:
+                keys.append(("_names", name))
+
+        email = normalize_text(client.email)
+        if email:
+            keys.append(("_emails", email))
+
+        for phone in client.phones or []:
+            number = normalize_phone(phone.number)
+            if number:
+                keys.append(("_phones", number))
+                # Operators often type the number without the country code
+                if len(number) == 11 and number.startswith("7"):
+                    keys.append(("_phones", number[1:]))
+
+        return list(dict.fromkeys(keys))
+
+    def _remove(self, client_id: int):
+        for field, key in self._keys.pop(client_id, []):
+            entries = getattr(self, field)
+            position = bisect_left(entries, (key, client_id))
+            if position < len(entries) and entries[position] == (key, client_id):
+                del entries[position]
+
+        self._clients.pop(client_id, None)
+
+    def add(self, client: ClientSearchResult):
+        if self._pending is not None:
+            self._pending.append(client)
+
+        self._remove(client.id)
+
+        keys = self._fields(client)
+        for field, key in keys:
+            insort(getattr(self, field), (key, client.id))
+
+        self._clients[client.id] = client
+        self._keys[client.id] = keys
+
+    def begin_rebuild(self):
+        self._pending = []
+
+    @classmethod
+    def _build(cls, clients: list[ClientSearchResult]) -> "ClientSearchIndex":
+        index = cls()
+        for client in clients:
+            index._clients[client.id] = client
+            index._keys[client.id] = index._fields(client)
+            for field, key in index._keys[client.id]:
+                getattr(index, field).append((key, client.id))
+
+        index._names.sort()
+        index._emails.sort()
+        index._phones.sort()
+
+        return index
+
+    def _swap(self, index: "ClientSearchIndex"):
+        (
+            self._clients,
+            self._keys,
+            self._names,
+            self._emails,
+            self._phones,
+        ) = (
+            index._clients,
+            index._keys,
+            index._names,
+            index._emails,
+            index._phones,
+        )
+        self.ready = True
+
+        pending, self._pending = self._pending, None
+        for client in pending or []:
+            self.add(client)
+
+    def replace(self, clients: list[ClientSearchResult]):
+        self._swap(self._build(clients))
+
+    def _scan(
+        self,
+        entries: list[tuple[str, int]],
+        prefix: str,
+        found: dict[int, None],
+        limit: int,
+    ):
+        position = bisect_left(entries, (prefix,))
+        while (
+            len(found) < limit
+            and position < len(entries)
+            and entries[position][0].startswith(prefix)
+        ):
+            found[entries[position][1]] = None
+            position += 1
+
+    def search(self, query: str, limit: int = 10) -> list[ClientSearchResult]:
+        found: dict[int, None] = {}
+
+        text = normalize_text(query)
+        if text:
+            self._scan(self._names, text, found, limit)
+            self._scan(self._emails, text, found, limit)
+
+        phone = normalize_phone(query)
+        if phone and PHONE_QUERY_RE.fullmatch(query.strip()):
+            self._scan(self._phones, phone, found, limit)
+            if phone.startswith("8"):
+                self._scan(self._phones, "7" + phone[1:], found, limit)
+
+        return [self._clients[client_id] for client_id in found]
+
+    def _write_snapshot(self, snapshot: dict):
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+
+    async def save(self):
+        if not self.snapshot_path or not self.ready:
+            return
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "clients": [client.model_dump() for client in self._clients.values()],
+        }
+        try:
+            await asyncio.to_thread(self._write_snapshot, snapshot)
+        except OSError:
+            logger.exception(
+                "Failed to save client search index snapshot '%s'", self.snapshot_path
+            )
+            return
+
+        logger.info(
+            "Client search index snapshot saved to '%s' (%d clients)",
+            self.snapshot_path,
+            len(self),
+        )
+
+    def _read_snapshot(self) -> "ClientSearchIndex | None":
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+            saved_at = os.fstat(f.fileno()).st_mtime
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            logger.warning(
+                "Client search index snapshot '%s' is outdated", self.snapshot_path
+            )
+            return None
+
+        index = self._build(
+            [ClientSearchResult(**client) for client in snapshot.get("clients", [])]
+        )
+        index.saved_at = saved_at
+
+        return index
+
+    async def load(self) -> bool:
+        if not self.snapshot_path:
+            return False
+
+        self.begin_rebuild()
+        try:
+            index = await asyncio.to_thread(self._read_snapshot)
+        except FileNotFoundError:
+            index = None
+        except (OSError, ValueError, TypeError, AttributeError):
+            logger.exception(
+                "Failed to read client search index snapshot '%s'", self.snapshot_path
+            )
+            index = None
+
+        if index is None:
+            self._pending = None
+            return False
+
+        self._swap(index)
+        self.saved_at = index.saved_at
+        logger.info(
+            "Client search index loaded from '%s' (%d clients)",
+            self.snapshot_path,
+            len(self),
+        )
+
+        return True
+
+
+async def maintain_client_search_index(api_client, refresh_interval: float):
+    """Load the snapshot (if any) and keep the index fresh with periodic rebuilds.
+
+    A loaded snapshot counts as a rebuild made when the snapshot was saved.
+
+    Failed rebuilds are retried with an exponential backoff capped at
+    ``REBUILD_RETRY_MAX_DELAY``; ``refresh_interval`` only applies after a success.
+    """
+    search_index = api_client.search_index
+    if await search_index.load():
+        snapshot_age = time.time() - search_index.saved_at
+        await asyncio.sleep(max(0, refresh_interval - snapshot_age))
+
+    retry_delay = REBUILD_RETRY_MIN_DELAY
+    while True:
+        try:
+            await api_client.rebuild_search_index()
+        except Exception:
+            logger.exception(
+                "Client search index rebuild failed. Retrying in %d sec...",
+                retry_delay,
+            )
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, REBUILD_RETRY_MAX_DELAY)
+            continue
+
+        await search_index.save()
+        retry_delay = REBUILD_RETRY_MIN_DELAY
+        await asyncio.sleep(refresh_interval)
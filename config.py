@@ -1,9 +1,50 @@
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings
 
 
+class RetailCRMAccount(BaseModel):
+    api_key: str
+    subdomain: str
+
+
 class Settings(BaseSettings):
-    RETAILCRM_API_KEY: str
-    RETAILCRM_SUBDOMAIN: str
+    RETAILCRM_API_KEY: str | None = None
+    RETAILCRM_SUBDOMAIN: str | None = None
+
+    RETAILCRM_ACCOUNTS: dict[str, RetailCRMAccount] = {}
+    RETAILCRM_DEFAULT_ACCOUNT: str = "default"
+    RETAILCRM_MAX_ACTIVE_ACCOUNTS: int = Field(default=20, ge=1)
+    RETAILCRM_HEDGE_PERCENTILE: float | None = Field(default=None, gt=0, le=100)
+    RETAILCRM_RESPONSE_CACHE_TTL: float = Field(default=0, ge=0)
+
+    CLIENT_SEARCH_INDEX_ENABLED: bool = False
+    CLIENT_SEARCH_INDEX_DIR: str | None = None
+    CLIENT_SEARCH_INDEX_REFRESH_INTERVAL: float = 3600
+
+    @model_validator(mode="after")
+    def validate_accounts(self):
+        if self.RETAILCRM_API_KEY and self.RETAILCRM_SUBDOMAIN:
+            self.RETAILCRM_ACCOUNTS.setdefault(
+                self.RETAILCRM_DEFAULT_ACCOUNT,
+                RetailCRMAccount(
+                    api_key=self.RETAILCRM_API_KEY,
+                    subdomain=self.RETAILCRM_SUBDOMAIN,
+                ),
+            )
+
+        if not self.RETAILCRM_ACCOUNTS:
+            raise ValueError(
+                "Either 'RETAILCRM_API_KEY' and 'RETAILCRM_SUBDOMAIN' "
+                "or 'RETAILCRM_ACCOUNTS' should be provided"
+            )
+
+        if self.RETAILCRM_DEFAULT_ACCOUNT not in self.RETAILCRM_ACCOUNTS:
+            raise ValueError(
+                f"'RETAILCRM_DEFAULT_ACCOUNT' ('{self.RETAILCRM_DEFAULT_ACCOUNT}') "
+                "should be one of 'RETAILCRM_ACCOUNTS'"
+            )
+
+        return self
 
 
 settings = Settings()